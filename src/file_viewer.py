@@ -1,21 +1,114 @@
-from typing import Optional, Union, Dict
+from typing import Optional, Union, Tuple
 from pathlib import Path
-import chardet
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import binascii
+import codecs
+import os
+import re
 import threading
-from queue import Queue
 import mmap
 
+# 编码检测后端：优先使用 C 实现的 cchardet，其次 charset_normalizer，最后回退到纯 Python 的 chardet
+try:
+    import cchardet as _chardet
+except ImportError:
+    try:
+        import charset_normalizer as _chardet
+    except ImportError:
+        import chardet as _chardet
+
+# 编码检测采样大小，cchardet 在几 KB 内即可收敛
+DETECT_SAMPLE_SIZE = 8192
+
+# 复用同一个检测器分块喂入，确定结果后提前结束。
+# 只用于 cchardet 和 6.0 之前的 chardet：新版 chardet 的一次性 detect 更快，charset_normalizer 没有增量接口
+if _chardet.__name__ == 'cchardet' or (
+        _chardet.__name__ == 'chardet' and int(_chardet.__version__.split('.')[0]) < 6):
+    _detector = _chardet.UniversalDetector()
+else:
+    _detector = None
+_detector_lock = threading.Lock()  # 检测器不是线程安全的
+
+# 字节序标记，UTF-32 LE 的 BOM 以 UTF-16 LE 的 BOM 开头，需先判断
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+def decodes_as(buf: bytes, encoding: str) -> bool:
+    """检查字节样本能否按指定编码解码
+    样本末尾可能截断多字节字符，使用增量解码器校验
+    """
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(buf, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+def sniff_encoding(buf: bytes) -> Optional[str]:
+    """通过 BOM、纯 ASCII 或 UTF-8 校验快速判断编码，无法判断时返回 None"""
+    for bom, encoding in _BOMS:
+        if buf.startswith(bom):
+            return encoding
+            
+    # 含 NUL 的可能是二进制或无 BOM 的 UTF-16，交给完整检测
+    if b'\x00' in buf:
+        return None
+        
+    # ASCII 是 UTF-8 的子集，统一按 UTF-8 处理，样本之后出现非 ASCII 字符也能正确解码
+    if buf.isascii():
+        return 'utf-8'
+        
+    return 'utf-8' if decodes_as(buf, 'utf-8') else None
+
+def detect_encoding(buf: bytes) -> Tuple[Optional[str], float]:
+    """检测字节序列的编码
+    返回: (编码, 置信度)
+    """
+    encoding = sniff_encoding(buf)
+    if encoding:
+        return encoding, 1.0
+        
+    if _detector is None:
+        result = _chardet.detect(buf)
+    else:
+        with _detector_lock:
+            _detector.reset()
+            for i in range(0, len(buf), 4096):
+                _detector.feed(buf[i:i + 4096])
+                if _detector.done:
+                    break
+            _detector.close()
+            result = _detector.result
+    return result['encoding'], result['confidence'] or 0.0
+
+# 行分隔符，与 str.splitlines 一致地把单独的 \r 也视为换行
+_LINE_BREAK = re.compile(r'\r\n?|\n')
+
+# 十六进制视图 ASCII 列的查找表：可打印字符保持原样，其余显示为 "."
+_ASCII_TABLE = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in range(256))
+
+# 所有查看器共用的后台加载线程池，避免每打开一个文件就创建一个线程
+_loader = ThreadPoolExecutor(max_workers=2, thread_name_prefix='file-loader')
+
 class FileViewer:
     """文件查看器核心类"""
     def __init__(self, file_path: Union[str, Path]):
         self.file_path = Path(file_path).absolute()
-        self.content: Optional[bytes] = None
+        self.content: Optional[Union[bytes, mmap.mmap]] = None
+        self._mmap: Optional[mmap.mmap] = None
         self.encoding: Optional[str] = None
         self.file_type: str = self._detect_file_type()
-        self.cache: Dict[int, str] = {}  # 行缓存
+        self._text: str = ''  # 已解码的文本
+        self._line_offsets = array('Q', [0])  # 每行起始位置，末项为下一行起点
         self.chunk_size = 4096  # 读取块大小
-        self.load_queue = Queue()
-        self.loading_thread: Optional[threading.Thread] = None
+        self._loaded = threading.Event()  # 没有进行中的后台加载时处于置位状态
+        self._loaded.set()
+        self._error: Optional[Exception] = None  # 后台加载中发生的异常
         
     def _detect_file_type(self) -> str:
         """检测文件类型"""
@@ -36,9 +129,14 @@ class FileViewer:
             if self.file_type == 'directory':
                 return self._load_directory()
                 
-            # 读取文件内容
+            # 内存映射文件内容，按需缺页读取，避免整文件拷贝
             with open(self.file_path, 'rb') as f:
-                self.content = f.read()
+                if os.fstat(f.fileno()).st_size > 0:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self.content = self._mmap
+                else:
+                    # 大小为 0 的可能是 /proc、/sys 等伪文件，无法映射，直接读取
+                    self.content = f.read()
                 
             # 检测文件编码
             self.encoding = self._detect_encoding()
@@ -49,81 +147,120 @@ class FileViewer:
             else:
                 # 小文件直接处理
                 if self.encoding:
-                    text = self.content.decode(self.encoding)
-                    lines = text.splitlines()
-                    for i, line in enumerate(lines):
-                        self.cache[i] = line
+                    self._publish_text(str(self.content, self.encoding), final=True)
                         
             return True
             
         except Exception as e:
+            self.close()
             self.content = None
             self.encoding = None
             raise FileViewerError(f"加载文件失败: {str(e)}")
             
+    def close(self):
+        """释放文件映射"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self.content = None
+            
+    def __del__(self):
+        self.close()
+            
     def _start_background_load(self):
-        """在后台线程中加载文件"""
-        if self.loading_thread and self.loading_thread.is_alive():
+        """提交到共享线程池中后台加载文件"""
+        if self.is_loading:
             return
             
-        self.loading_thread = threading.Thread(
-            target=self._background_load,
-            daemon=True
-        )
-        self.loading_thread.start()
+        self._error = None
+        self._loaded.clear()
+        _loader.submit(self._background_load)
+        
+    @property
+    def is_loading(self) -> bool:
+        """是否仍在后台加载"""
+        return not self._loaded.is_set()
+        
+    @property
+    def load_error(self) -> Optional[Exception]:
+        """后台加载失败时的异常"""
+        return self._error
         
     def _background_load(self):
         """后台加载文件内容"""
         try:
-            with open(self.file_path, 'rb') as f:
-                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-                    # 先读取一小块用于编码检测
-                    sample = mm[:min(self.chunk_size, len(mm))]
-                    result = chardet.detect(sample)
-                    self.encoding = result['encoding'] if result['confidence'] > 0.7 else 'utf-8'
-                    
-                    # 分块读取并解码
-                    offset = 0
-                    line_num = 0
-                    buffer = []
+            # 与 load 共用同一个映射 (伪文件为已读入的字节串)；映射被 close 时读取会抛出异常，加载随之终止
+            mm = self.content
+            
+            # 复用 load 中对同一样本的编码检测结果，检测失败时按 UTF-8 解码
+            self.encoding = self.encoding or 'utf-8'
+            
+            # 分块读取并解码，增量解码器会保留跨块的多字节字符
+            decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+            offset = 0
+            parts = []
+            pending = 0
+            
+            while offset < len(mm):
+                text = decoder.decode(mm[offset:offset + self.chunk_size], final=False)
+                parts.append(text)
+                pending += len(text)
+                
+                # 未发布的文本不少于已发布的文本时才合并发布，拷贝总量保持线性
+                if pending >= len(self._text):
+                    self._publish_text(''.join([self._text, *parts]))
+                    parts.clear()
+                    pending = 0
                     
-                    while offset < len(mm):
-                        chunk = mm[offset:offset + self.chunk_size]
-                        try:
-                            text = chunk.decode(self.encoding)
-                            lines = text.splitlines()
-                            
-                            # 处理跨块的行
-                            if buffer:
-                                lines[0] = buffer.pop() + lines[0]
-                                
-                            # 缓存完整的行
-                            for line in lines[:-1]:
-                                self.cache[line_num] = line
-                                line_num += 1
-                                
-                            # 保存可能不完整的最后一行
-                            buffer = [lines[-1]]
-                            
-                        except UnicodeDecodeError:
-                            pass
-                            
-                        offset += self.chunk_size
-                        
-                    # 处理最后一行
-                    if buffer:
-                        self.cache[line_num] = buffer[0]
-                        
+                offset += self.chunk_size
+                
+            parts.append(decoder.decode(b'', final=True))
+            self._publish_text(''.join([self._text, *parts]), final=True)
+                
         except Exception as e:
-            self.load_queue.put(e)
+            self._error = e
+        finally:
+            self._loaded.set()
+            
+    def _publish_text(self, text: str, final: bool = False):
+        """发布已解码的文本，并为新增部分建立行偏移索引
+        text 必须以当前已发布的文本为前缀
+        """
+        # 先替换文本再追加偏移，读线程看到的行总是落在已发布的文本内
+        self._text = text
+        offsets = self._line_offsets
+        
+        # \n、\r\n 和单独的 \r 都是换行；末尾的 \r 可能与下一块开头的 \n 组成 \r\n，等下次发布再处理
+        end = len(text)
+        if not final and text.endswith('\r'):
+            end -= 1
+        start = offsets[-1]
+        if text.find('\r', start, end) == -1:
+            # 常见情况：没有 \r，直接查找 \n 更快
+            pos = text.find('\n', start, end)
+            while pos != -1:
+                offsets.append(pos + 1)
+                pos = text.find('\n', pos + 1, end)
+        else:
+            for match in _LINE_BREAK.finditer(text, start, end):
+                offsets.append(match.end())
+            
+        # 没有换行符结尾的最后一行
+        if final and len(text) > offsets[-1]:
+            offsets.append(len(text) + 1)
             
     def get_line(self, line_num: int) -> Optional[str]:
         """获取指定行的内容"""
-        return self.cache.get(line_num)
+        offsets = self._line_offsets
+        if not 0 <= line_num < len(offsets) - 1:
+            return None
+            
+        line = self._text[offsets[line_num]:offsets[line_num + 1] - 1]
+        return line[:-1] if line.endswith('\r') else line
         
     def get_line_count(self) -> int:
         """获取总行数"""
-        return max(self.cache.keys()) + 1 if self.cache else 0
+        return len(self._line_offsets) - 1
     
     def _detect_encoding(self) -> Optional[str]:
         """检测文件编码"""
@@ -131,9 +268,9 @@ class FileViewer:
             return None
             
         try:
-            result = chardet.detect(self.content)
-            if result['confidence'] > 0.7:
-                return result['encoding']
+            encoding, confidence = detect_encoding(self.content[:DETECT_SAMPLE_SIZE])
+            if confidence > 0.7:
+                return encoding
         except Exception:
             pass
             
@@ -142,8 +279,10 @@ class FileViewer:
     def _load_directory(self) -> bool:
         """加载目录内容"""
         try:
-            entries = list(self.file_path.iterdir())
-            self.content = "\n".join(str(entry.name) for entry in sorted(entries)).encode()
+            # 直接对名称排序，不为每个条目创建 Path 对象
+            with os.scandir(self.file_path) as it:
+                names = sorted(entry.name for entry in it)
+            self.content = "\n".join(names).encode()
             self.encoding = 'utf-8'
             return True
         except Exception as e:
@@ -154,19 +293,14 @@ class FileViewer:
         if not self.content:
             return None
             
-        # 如果已经缓存了行，从缓存构建内容
-        if self.cache:
-            lines = []
-            for i in range(self.get_line_count()):
-                line = self.cache.get(i)
-                if line is not None:
-                    lines.append(line)
-            return '\n'.join(lines)
+        # 如果已经解码过文本，直接返回
+        if self._text:
+            return self._text
             
         # 否则尝试直接解码
         if self.encoding:
             try:
-                return self.content.decode(self.encoding)
+                return str(self.content, self.encoding)
             except UnicodeDecodeError:
                 pass
                 
@@ -178,16 +312,16 @@ class FileViewer:
         if not self.content:
             return ""
             
-        lines = []
-        for i in range(0, len(self.content), bytes_per_line):
-            chunk = self.content[i:i + bytes_per_line]
-            # 十六进制表示
-            hex_line = " ".join(f"{b:02x}" for b in chunk)
-            # ASCII 表示
-            ascii_line = "".join(chr(b) if 32 <= b <= 126 else "." for b in chunk)
-            # 对齐处理
-            hex_line = f"{hex_line:<{bytes_per_line * 3}}"
-            lines.append(f"{i:08x}  {hex_line}  |{ascii_line}|")
+        # 十六进制与 ASCII 表示都对整个缓冲区一次性生成（同时支持 bytes 与 mmap），每行只做切片
+        hex_text = binascii.hexlify(self.content, ' ').decode('ascii')
+        ascii_text, _ = codecs.charmap_decode(self.content, 'strict', _ASCII_TABLE)
+        
+        # 行格式只构建一次，%-Ns 同时完成对齐
+        fmt = ("%%08x  %%-%ds  |%%s|" % (bytes_per_line * 3)).__mod__
+        lines = [
+            fmt((i, hex_text[i * 3:(i + bytes_per_line) * 3 - 1], ascii_text[i:i + bytes_per_line]))
+            for i in range(0, len(self.content), bytes_per_line)
+        ]
             
         return "\n".join(lines)
     
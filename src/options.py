@@ -4,6 +4,12 @@ from typing import Optional, Dict, Tuple
 import json
 import curses
 
+# orjson 解析和序列化都更快，未安装时使用标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def default_color_schemes() -> Dict[str, Dict[str, Tuple[int, int]]]:
     """返回默认的颜色方案"""
     return {
@@ -25,6 +31,24 @@ def default_color_schemes() -> Dict[str, Dict[str, Tuple[int, int]]]:
         },
     }
 
+class ColorRegistry:
+    """全局颜色对分配器
+    相同的 (前景色, 背景色) 共用一个颜色对编号，编号单调递增，避免各模块各自分配时互相覆盖
+    """
+    _pairs: Dict[Tuple[int, int], int] = {}
+    
+    @classmethod
+    def get_pair(cls, fg: int, bg: int) -> int:
+        """获取颜色对编号，首次使用时初始化；编号耗尽时返回 0"""
+        pair = cls._pairs.get((fg, bg))
+        if pair is None:
+            pair = len(cls._pairs) + 1
+            if pair >= curses.COLOR_PAIRS:
+                return 0
+            curses.init_pair(pair, fg, bg)
+            cls._pairs[(fg, bg)] = pair
+        return pair
+
 @dataclass
 class ViewerOptions:
     """查看器配置选项"""
@@ -57,6 +81,10 @@ class ViewerOptions:
     # 语法高亮主题
     syntax_theme: str = "monokai"  # 可选: monokai, github, etc.
     
+    # 颜色名称 -> 颜色对编号，随主题切换重建
+    _pair_index: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _pair_theme: Optional[str] = field(default=None, init=False, repr=False)
+    
     @classmethod
     def load(cls, config_path: Optional[Path] = None) -> 'ViewerOptions':
         """从配置文件加载选项"""
@@ -65,8 +93,8 @@ class ViewerOptions:
             
         if config_path.exists():
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                data = config_path.read_bytes()
+                config = orjson.loads(data) if orjson else json.loads(data)
                 return cls(**config)
             except Exception as e:
                 print(f"加载配置文件失败: {e}")
@@ -97,8 +125,11 @@ class ViewerOptions:
             "syntax_theme": self.syntax_theme,
         }
         
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=4)
+        if orjson:
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(config, indent=4).encode('utf-8')
+        config_path.write_bytes(data)
             
     def init_colors(self):
         """初始化颜色方案"""
@@ -108,18 +139,20 @@ class ViewerOptions:
         curses.start_color()
         curses.use_default_colors()
         
-        # 获取当前主题的颜色方案
+        self._build_pair_index()
+            
+    def _build_pair_index(self):
+        """为当前主题分配颜色对，并建立颜色名称到颜色对编号的索引"""
         scheme = self.color_schemes.get(self.theme, self.color_schemes["default"])
-        
-        # 初始化颜色对
-        for idx, (name, (fg, bg)) in enumerate(scheme.items(), start=1):
-            curses.init_pair(idx, fg, bg)
+        self._pair_index = {name: ColorRegistry.get_pair(fg, bg) for name, (fg, bg) in scheme.items()}
+        self._pair_theme = self.theme
             
     def get_color(self, name: str) -> int:
         """获取指定名称的颜色属性"""
-        scheme = self.color_schemes.get(self.theme, self.color_schemes["default"])
-        if name not in scheme:
-            return 0
+        if self._pair_theme != self.theme and curses.has_colors():
+            self._build_pair_index()
             
-        idx = list(scheme.keys()).index(name) + 1
+        idx = self._pair_index.get(name)
+        if idx is None:
+            return 0
         return curses.color_pair(idx) 
\ No newline at end of file
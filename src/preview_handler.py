@@ -1,23 +1,91 @@
 from pathlib import Path
-from typing import Optional
+from itertools import islice
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+from typing import Optional, Tuple
 import mimetypes  
 from PIL import Image  # 处理图片
 import docx  # 处理 Word 文档
 from PyPDF2 import PdfReader  # 处理 PDF
-import chardet  # 处理文本编码
+from .file_viewer import decodes_as, detect_encoding, sniff_encoding  # 处理文本编码
+
+# 编码检测只读取文件开头的样本
+TEXT_SAMPLE_SIZE = 65536
 
 class PreviewHandler:
     """文件预览处理器"""
     
     def __init__(self):
         mimetypes.init()
+        # 扩展名 -> MIME类型 / 文本编码，同类文件复用识别结果；分开存放，互不覆盖
+        self._mime_cache: dict[str, Optional[str]] = {}
+        self._encoding_cache: dict[str, str] = {}
+        # 预取预览共用的线程池，以及 (路径, 行数) -> (修改时间, Future) 的 LRU 缓存
+        self._executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix='preview')
+        self._cache: OrderedDict[Tuple[Path, int], Tuple[int, Future]] = OrderedDict()
+        self.cache_size = 256
+        
+    def prefetch(self, paths: list[Path], max_lines: int = 100):
+        """在线程池中并行生成一批文件的预览"""
+        for path in paths:
+            key = (path, max_lines)
+            mtime = self._mtime(path)
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == mtime:
+                self._cache.move_to_end(key)
+                continue
+            if mtime is not None:
+                self._cache[key] = (mtime, self._executor.submit(self._generate_preview, path, max_lines))
+                
+        self._trim_cache()
+        
+    def close(self):
+        """取消尚未开始的预取任务并关闭线程池"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._cache.clear()
         
     def get_preview(self, file_path: Path, max_lines: int = 100) -> tuple[str, str]:
-        """获取文件预览内容
+        """获取文件预览内容，文件未修改时直接使用缓存或预取的结果
         返回: (文件类型描述, 预览内容)
         """
+        key = (file_path, max_lines)
+        mtime = self._mtime(file_path)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            future = cached[1]
+            # 还在排队的预取任务取消后直接生成，不等待排在前面的其他预取；只等待已在运行的任务
+            if future.done() or not future.cancel():
+                if not future.cancelled():
+                    self._cache.move_to_end(key)
+                    return future.result()
+                    
+        result = self._generate_preview(file_path, max_lines)
+        if mtime is not None:
+            future = Future()
+            future.set_result(result)
+            self._cache[key] = (mtime, future)
+            self._trim_cache()
+        return result
+        
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        """文件的修改时间 (纳秒)，无法获取时为 None，此时不缓存预览"""
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+            
+    def _trim_cache(self):
+        """淘汰最久未使用的预览，超出容量的预取任务如未开始则取消"""
+        while len(self._cache) > self.cache_size:
+            _, (_, future) = self._cache.popitem(last=False)
+            future.cancel()
+            
+    def _generate_preview(self, file_path: Path, max_lines: int) -> tuple[str, str]:
+        """生成文件预览内容"""
         try:
-            mime_type, _ = mimetypes.guess_type(str(file_path))
+            mime_type = self._guess_type(file_path)
             if mime_type is None:
                 return ('未知文件类型', '无法预览此类型的文件')
             
@@ -37,19 +105,57 @@ class PreviewHandler:
         except Exception as e:
             return ('错误', f'预览失败: {str(e)}')
             
+    def _guess_type(self, file_path: Path) -> Optional[str]:
+        """猜测文件的MIME类型，按扩展名缓存"""
+        # 多重扩展名 (如 a.tar.gz) 的类型取决于前面的扩展名，不按最后一个扩展名缓存
+        if len(file_path.suffixes) > 1:
+            return mimetypes.guess_type(str(file_path))[0]
+            
+        suffix = file_path.suffix.lower()
+        if suffix in self._mime_cache:
+            return self._mime_cache[suffix]
+            
+        mime_type, _ = mimetypes.guess_type(str(file_path))
+        if suffix:
+            self._mime_cache[suffix] = mime_type
+        return mime_type
+        
+    def _text_encoding(self, file_path: Path, raw: bytes) -> str:
+        """获取文本编码：先快速判断 BOM/ASCII/UTF-8，否则复用同扩展名文件的检测结果，
+        解码失败时重新检测
+        """
+        # GBK、CP932 等旧编码几乎能解码任意字节，必须先排除 UTF-8，缓存只代替完整检测
+        encoding = sniff_encoding(raw)
+        if encoding:
+            return encoding
+            
+        suffix = file_path.suffix.lower()
+        encoding = self._encoding_cache.get(suffix)
+        if encoding and decodes_as(raw, encoding):
+            return encoding
+            
+        encoding, confidence = detect_encoding(raw)
+        if suffix:
+            # 置信度过低的结果不缓存，并使旧结果失效
+            if encoding and confidence >= 0.5:
+                self._encoding_cache[suffix] = encoding
+            else:
+                self._encoding_cache.pop(suffix, None)
+        return encoding or 'utf-8'
+        
     def _handle_text(self, file_path: Path, max_lines: int) -> tuple[str, str]:
         """处理文本文件"""
         # 检测文件编码
         with open(file_path, 'rb') as f:
-            raw = f.read()
-            result = chardet.detect(raw)
-            encoding = result['encoding'] or 'utf-8'
+            raw = f.read(TEXT_SAMPLE_SIZE)
+            encoding = self._text_encoding(file_path, raw)
             
-        # 读取文件内容
-        with open(file_path, 'r', encoding=encoding) as f:
-            lines = f.readlines()[:max_lines]
-            content = ''.join(lines)
-            if len(lines) >= max_lines:
+        # 只读取需要预览的行，不把整个文件读入内存
+        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+            lines = list(islice(f, max_lines + 1))
+            truncated = len(lines) > max_lines
+            content = ''.join(lines[:max_lines])
+            if truncated:
                 content += f'\n... (还有更多内容)'
                 
         return ('文本文件', content)
@@ -1,9 +1,54 @@
 from pygments import highlight
+from pygments.lexer import Lexer
 from pygments.lexers import get_lexer_for_filename, TextLexer
 from pygments.token import Token
 from pygments.util import ClassNotFound
 import curses
 from pathlib import Path
+from typing import Iterator, Optional
+from .options import ColorRegistry
+
+# 可选的 tree-sitter 后端，未安装时使用 Pygments
+try:
+    from tree_sitter_languages import get_parser
+except ImportError:
+    get_parser = None
+
+# tree-sitter 节点类型到 Pygments token 类型的映射
+_TS_NODE_TOKENS = {
+    'comment': Token.Comment,
+    'line_comment': Token.Comment,
+    'block_comment': Token.Comment,
+    'string': Token.String,
+    'string_literal': Token.String,
+    'raw_string_literal': Token.String,
+    'char_literal': Token.String,
+    'template_string': Token.String,
+    'interpreted_string_literal': Token.String,
+    'integer': Token.Number,
+    'float': Token.Number,
+    'number': Token.Number,
+    'integer_literal': Token.Number,
+    'float_literal': Token.Number,
+    'int_literal': Token.Number,
+}
+
+# 定义类节点，其 name 字段按函数名/类名着色
+_TS_DEFINITIONS = {
+    'function_definition': Token.Name.Function,
+    'function_declaration': Token.Name.Function,
+    'function_item': Token.Name.Function,
+    'method_definition': Token.Name.Function,
+    'method_declaration': Token.Name.Function,
+    'class_definition': Token.Name.Class,
+    'class_declaration': Token.Name.Class,
+    'struct_item': Token.Name.Class,
+}
+
+_TS_OPERATORS = {
+    '+', '-', '*', '/', '%', '**', '//', '=', '==', '!=', '<', '>', '<=', '>=',
+    '&&', '||', '!', '&', '|', '^', '~', '<<', '>>', '+=', '-=', '*=', '/=', ':=', '->', '=>',
+}
 
 class CursesHighlighter:
     """Curses语法高亮器"""
@@ -19,34 +64,140 @@ class CursesHighlighter:
             Token.Name.Function: (curses.COLOR_RED, curses.COLOR_BLACK),
             Token.Name.Class: (curses.COLOR_GREEN, curses.COLOR_BLACK),
         }
+        self._pair_map: dict = {}  # token类型 -> 颜色对编号
+        self._lexer_cache: dict[str, Lexer] = {}  # 文件名 -> 词法分析器
+        self._attr_cache: dict = {}  # token类型 -> 颜色属性
+        self._parser_cache: dict = {}  # 语言名 -> tree-sitter 解析器（不支持时为 None）
         
     def init_colors(self, theme: str = "monokai"):
         """初始化curses颜色对，需要在curses初始化后调用"""
-        for idx, (token, (fg, bg)) in enumerate(self.color_map.items(), start=10):
-            curses.init_pair(idx, fg, bg)
-            self.color_map[token] = idx
+        self._pair_map = {token: ColorRegistry.get_pair(fg, bg) for token, (fg, bg) in self.color_map.items()}
+        self._resolve_token_tree()
+        
+    def _resolve_token_tree(self):
+        """预先为token树中的每个类型解析出最近的着色祖先，高亮时只需一次字典查找"""
+        cache = {}
+        stack = [(Token, 0)]
+        while stack:
+            token_type, pair = stack.pop()
+            pair = self._pair_map.get(token_type, pair)
+            cache[token_type] = curses.color_pair(pair)
+            stack.extend((sub, pair) for sub in token_type.subtypes)
+        self._attr_cache = cache
+            
+    def _get_lexer(self, file_path: Path) -> Lexer:
+        """获取文件对应的词法分析器，按文件名缓存"""
+        name = file_path.name
+        lexer = self._lexer_cache.get(name)
+        if lexer is None:
+            # 保留首尾空行，保证分词结果与输入行一一对应
+            try:
+                lexer = get_lexer_for_filename(name, stripnl=False, ensurenl=False)
+            except ClassNotFound:
+                lexer = TextLexer(stripnl=False, ensurenl=False)
+            self._lexer_cache[name] = lexer
+        return lexer
+        
+    def _get_parser(self, lexer: Lexer):
+        """获取与词法分析器同语言的 tree-sitter 解析器，不支持时返回 None"""
+        if get_parser is None or not lexer.aliases:
+            return None
+            
+        language = lexer.aliases[0]
+        if language not in self._parser_cache:
+            try:
+                self._parser_cache[language] = get_parser(language)
+            except Exception:
+                self._parser_cache[language] = None
+        return self._parser_cache[language]
+        
+    @staticmethod
+    def _node_token(node) -> Optional[object]:
+        """获取 tree-sitter 节点对应的 token 类型，无需着色时返回 None"""
+        if node.type in _TS_NODE_TOKENS:
+            return _TS_NODE_TOKENS[node.type]
+            
+        if not node.is_named:
+            if node.type.isidentifier():
+                return Token.Keyword
+            if node.type in _TS_OPERATORS:
+                return Token.Operator
+            return None
+            
+        parent = node.parent
+        if parent is not None and parent.type in _TS_DEFINITIONS \
+                and parent.child_by_field_name('name') == node:
+            return _TS_DEFINITIONS[parent.type]
+        return None
+        
+    def _tree_sitter_tokens(self, parser, source: str) -> Iterator[tuple]:
+        """解析语法树，生成与 Pygments get_tokens 相同形式的 (token类型, 文本) 序列"""
+        data = source.encode('utf-8')
+        tree = parser.parse(data)
+        cursor = 0
+        stack = [tree.root_node]
+        
+        while stack:
+            node = stack.pop()
+            token_type = self._node_token(node)
+            if token_type is None:
+                stack.extend(reversed(node.children))
+                continue
+                
+            start = max(node.start_byte, cursor)
+            if start > cursor:
+                yield Token.Text, data[cursor:start].decode('utf-8', 'replace')
+            yield token_type, data[start:node.end_byte].decode('utf-8', 'replace')
+            cursor = max(cursor, node.end_byte)
+            
+        if cursor < len(data):
+            yield Token.Text, data[cursor:].decode('utf-8', 'replace')
             
+    def _get_attr(self, token_type) -> int:
+        """解析预计算表中没有的token类型（词法分析器后来才创建的类型）并缓存"""
+        # 查找最匹配的token类型
+        resolved = token_type
+        while resolved not in self.color_map and resolved.parent:
+            resolved = resolved.parent
+        attr = curses.color_pair(self._pair_map.get(resolved, 0))
+        self._attr_cache[token_type] = attr
+        return attr
+        
     def highlight_line(self, file_path: Path, line: str) -> list[tuple[str, int]]:
         """对单行文本进行语法高亮
         返回: [(文本片段, 颜色属性), ...]
         """
-        try:
-            lexer = get_lexer_for_filename(file_path.name)
-        except ClassNotFound:
-            lexer = TextLexer()
-            
-        tokens = list(lexer.get_tokens(line))
-        result = []
+        return self.highlight_lines(file_path, [line])[0]
+        
+    def highlight_lines(self, file_path: Path, lines: list[str]) -> list[list[tuple[str, int]]]:
+        """对多行文本一次性进行语法高亮
+        返回: 每行一个 [(文本片段, 颜色属性), ...]
+        """
+        lexer = self._get_lexer(file_path)
+        source = '\n'.join(lines)
+        
+        # 有对应语法的语言优先使用 tree-sitter，否则回退到 Pygments
+        parser = self._get_parser(lexer)
+        tokens = self._tree_sitter_tokens(parser, source) if parser else lexer.get_tokens(source)
+        
+        result = [[] for _ in lines]
+        row = 0
+        attr_cache = self._attr_cache
         
         for token_type, value in tokens:
-            # 查找最匹配的token类型
-            while token_type not in self.color_map and token_type.parent:
-                token_type = token_type.parent
-                
-            # 获取颜色属性
-            color_pair = self.color_map.get(token_type, 0)
-            attr = curses.color_pair(color_pair)
-            
-            result.append((value, attr))
-            
-        return result 
\ No newline at end of file
+            attr = attr_cache.get(token_type)
+            if attr is None:
+                attr = self._get_attr(token_type)
+            # 跨行的token按换行符拆分到各行
+            for i, part in enumerate(value.split('\n')):
+                if i:
+                    row += 1
+                if part and row < len(result):
+                    # 与前一片段颜色相同时合并，绘制时每段只需一次 addstr
+                    segments = result[row]
+                    if segments and segments[-1][1] == attr:
+                        segments[-1] = (segments[-1][0] + part, attr)
+                    else:
+                        segments.append((part, attr))
+                    
+        return result
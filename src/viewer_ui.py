@@ -1,5 +1,10 @@
 import curses
+import heapq
 import os
+import sys
+import time
+import unicodedata
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Optional, Tuple
 from .file_viewer import FileViewer, FileViewerError
@@ -7,21 +12,122 @@ from .preview_handler import PreviewHandler
 from .syntax_highlighter import CursesHighlighter
 from .options import ViewerOptions
 
+# 进入目录时预取预览的文件数
+PREFETCH_COUNT = 32
+
+# 阅读模式的行号格式
+_LINENO_FMT = "{:4} ".format
+
+# 阅读模式下两帧之间的最小间隔 (秒)，连续按键时最多约 60 帧每秒
+FRAME_INTERVAL = 1 / 60
+
+# 连续移动选择的间隔小于该值 (秒) 时，等按键停止后再生成预览
+PREVIEW_DEBOUNCE = 0.03
+
+# 需要重绘的区域
+DIRTY_LEFT = 1
+DIRTY_RIGHT = 2
+DIRTY_ALL = DIRTY_LEFT | DIRTY_RIGHT
+
+# 目录预览中条目的前缀
+DIR_PREFIX = "📁 "
+FILE_PREFIX = "📄 "
+
+# 终端同步输出 (DEC 模式 2026) 的开始/结束序列，不支持的终端会忽略
+SYNC_UPDATE_BEGIN = "\x1b[?2026h"
+SYNC_UPDATE_END = "\x1b[?2026l"
+
+# 文件列表中表示上级目录的条目名称，真实文件不会使用这个名称
+PARENT_ENTRY = ".."
+
+def _scan_directory(path: Path) -> Tuple[List[str], bytearray]:
+    """读取目录并按目录在前、名称不区分大小写排序
+    os.scandir 返回的条目缓存了类型信息，排序和绘制时不再需要 stat
+    返回: (名称列表, 对应条目是否为目录)
+    """
+    with os.scandir(path) as it:
+        items = [(not e.is_dir(), e.name.lower(), e.name) for e in it]
+    items.sort()
+    return [name for _, _, name in items], bytearray(not is_file for is_file, _, _ in items)
+
+def _scan_directory_top(path: Path, limit: int) -> Tuple[int, List[Tuple[bool, str, str]]]:
+    """读取目录，只取排序后的前 limit 项，不对整个目录排序
+    返回: (条目总数, [(是否为文件, 小写名称, 名称), ...])
+    """
+    total = 0
+    
+    def keyed(it):
+        nonlocal total
+        for e in it:
+            total += 1
+            yield (not e.is_dir(), e.name.lower(), e.name)
+            
+    with os.scandir(path) as it:
+        top = heapq.nsmallest(limit, keyed(it))
+    return total, top
+
+def _clip_cells(text: str, x: int, limit: int) -> Tuple[str, int]:
+    """把从第 x 列开始绘制的文本截断到 limit 列以内，按终端显示宽度计算
+    制表符展开为空格，东亚宽字符占 2 列，控制字符按 curses 的 ^X 形式占 2 列
+    返回: (截断后的文本, 绘制后的列号)
+    """
+    # 常见情况：可打印 ASCII 每个字符占一列
+    if text.isascii() and text.isprintable():
+        text = text[:max(0, limit - x)]
+        return text, x + len(text)
+        
+    out = []
+    for ch in text:
+        if ch == '\t':
+            w = 8 - x % 8
+            ch = ' ' * w
+        elif ch < ' ' or ch == '\x7f':
+            w = 2
+        elif unicodedata.combining(ch):
+            w = 0
+        elif unicodedata.east_asian_width(ch) in ('W', 'F'):
+            w = 2
+        else:
+            w = 1
+        if x + w > limit:
+            break
+        out.append(ch)
+        x += w
+    return ''.join(out), x
+
 class ViewerUI:
     def __init__(self, options: Optional[ViewerOptions] = None):
         self.options = options or ViewerOptions.load()
         self.screen = None
         self.current_path: Path = Path.cwd()
-        self.entries: List[Path] = []
+        # 当前目录的条目名称，以及对应条目是否为目录
+        self.entries: List[str] = []
+        self.entries_is_dir = bytearray()
         self.current_index: int = 0
         self.viewer = FileViewer(self.current_path)
         self.left_win = None
         self.right_win = None
+        self._left_width = 0
         self.preview_content: Optional[str] = None
         self.preview_handler = PreviewHandler()
         self.reading_mode = False  # 添加阅读模式标志
         self.scroll_position = 0   # 添加滚动位置
         self.highlighter = CursesHighlighter()
+        # 上一次绘制文件列表时的状态，用于判断是否只需重绘光标所在行
+        self._last_path: Optional[Path] = None
+        self._last_index = 0
+        self._last_start_index = 0
+        self._dirty_full = True
+        # 阅读模式下已高亮行的 LRU 缓存: (文件路径, 行号) -> [(文本片段, 颜色属性), ...]
+        self._hl_cache: OrderedDict[Tuple[Path, int], List[Tuple[str, int]]] = OrderedDict()
+        # 上一次绘制文件内容时的滚动位置，以及当时内容区域是否填满
+        self._last_scroll_position = 0
+        self._content_frame_full = False
+        # 上一次移动选择的时间，以及是否有因连续按键而推迟的预览
+        self._selection_changed_at = 0.0
+        self._preview_pending = False
+        # 阅读模式下已绘制的标题，未变化时重绘内容不必清空整个窗口
+        self._content_title: Optional[str] = None
         
     def _init_curses(self):
         """初始化curses"""
@@ -59,16 +165,45 @@ class ViewerUI:
         # 阅读模式下的左右分屏
         self.reading_left_width = width // 6  # 阅读模式时左窗口更窄
         
-        self._resize_windows(self.normal_left_width)
+        # 左右窗口只创建一次，切换模式时调整大小和位置
+        self.left_win = curses.newwin(height, self.normal_left_width, 0, 0)
+        self.left_win.keypad(True)
+        self.right_win = curses.newwin(height, width - self.normal_left_width, 0, self.normal_left_width)
+        self.right_win.keypad(True)
+        # 光标已隐藏，刷新时不必把光标移回绘制位置
+        self.right_win.leaveok(True)
+        self._left_width = self.normal_left_width
+        self._row_fmt = self._make_row_fmt(self.normal_left_width)
+        self._dirty_full = True
+        self._content_frame_full = False
+        self._content_title = None
+        
+    @staticmethod
+    def _make_row_fmt(left_width: int):
+        """生成文件列表行的格式化函数，格式说明只在窗口大小变化时解析一次"""
+        return (" {:<" + str(left_width - 2) + "}").format
         
     def _resize_windows(self, left_width: int):
-        """调整窗口大小"""
+        """调整窗口大小，复用已创建的窗口"""
+        if left_width == self._left_width:
+            return
+            
         height, width = self.screen.getmaxyx()
+        self.left_win.resize(height, left_width)
         
-        # 重新创建左右窗口
-        self.left_win = curses.newwin(height, left_width, 0, 0)
-        self.left_win.keypad(True)
-        self.right_win = curses.newwin(height, width - left_width, 0, left_width)
+        # 右窗口变宽时先移动再扩大，变窄时先缩小再移动，保证窗口始终在屏幕内
+        if left_width < self._left_width:
+            self.right_win.mvwin(0, left_width)
+            self.right_win.resize(height, width - left_width)
+        else:
+            self.right_win.resize(height, width - left_width)
+            self.right_win.mvwin(0, left_width)
+            
+        self._left_width = left_width
+        self._row_fmt = self._make_row_fmt(left_width)
+        self._dirty_full = True
+        self._content_frame_full = False
+        self._content_title = None
         
     def _display_preview(self):
         """显示预览内容"""
@@ -79,16 +214,19 @@ class ViewerUI:
         self.right_win.erase()
         
         # 获取当前选中的文件
-        selected = self.entries[self.current_index]
+        selected = self._entry_path(self.current_index)
         
         # 显示预览窗口标题
         title = f"预览: {selected.name}"
-        self.right_win.addstr(0, 0, title, curses.color_pair(3) | curses.A_BOLD)
-        self.right_win.addstr(1, 0, "-" * (width - 1))
+        self.right_win.addstr(0, 0, title, self.options.get_color('selected') | curses.A_BOLD)
+        self.right_win.hline(1, 0, "-", width - 1)
         
         try:
+            # 连续按键期间只显示占位符，按键停止后再生成预览
+            if self._preview_pending:
+                self.right_win.addstr(2, 0, "...")
             # 如果是目录，显示目录信息
-            if selected.is_dir():
+            elif self.entries_is_dir[self.current_index]:
                 self._preview_directory(selected, height, width)
             else:
                 self._preview_file(selected, height, width)
@@ -101,15 +239,15 @@ class ViewerUI:
     def _preview_directory(self, path: Path, height: int, width: int):
         """预览目录内容"""
         try:
-            entries = sorted(list(path.iterdir()), key=lambda x: (not x.is_dir(), x.name.lower()))
-            self.right_win.addstr(2, 0, f"包含 {len(entries)} 个项目")
-            
-            for i, entry in enumerate(entries[:height-4]):
-                prefix = "📁 " if entry.is_dir() else "📄 "
-                name = entry.name
-                if len(name) > width - 5:
-                    name = name[:width-8] + "..."
-                self.right_win.addstr(i+3, 0, f"{prefix}{name}")
+            total, entries = _scan_directory_top(path, max(0, height - 4))
+            self.right_win.addstr(2, 0, f"包含 {total} 个项目")
+            
+            # 名称最大宽度在循环外计算，只有超长的名称才需要切片
+            max_name = width - 5
+            for i, (is_file, _, name) in enumerate(entries):
+                if len(name) > max_name:
+                    name = name[:max_name-3] + "..."
+                self.right_win.addstr(i+3, 0, (FILE_PREFIX if is_file else DIR_PREFIX) + name)
                 
         except Exception as e:
             self.right_win.addstr(2, 0, f"无法读取目录: {str(e)}")
@@ -122,9 +260,9 @@ class ViewerUI:
             # 显示文件类型
             self.right_win.addstr(2, 0, f"类型: {file_type}")
             
-            # 显示预览内容
-            lines = content.split('\n')
-            for i, line in enumerate(lines[:height-4]):
+            # 显示预览内容，只切分出需要显示的行
+            lines = content.split('\n', height - 4)[:height - 4]
+            for i, line in enumerate(lines):
                 if len(line) > width - 2:
                     line = line[:width-5] + "..."
                 self.right_win.addstr(i+3, 0, line)
@@ -132,91 +270,177 @@ class ViewerUI:
         except Exception as e:
             self.right_win.addstr(2, 0, f"无法预览文件: {str(e)}")
             
+    def _visible_start(self, visible_entries: int) -> int:
+        """计算列表可见区域的起始索引"""
+        return max(0, min(self.current_index - visible_entries // 2,
+                          len(self.entries) - visible_entries))
+        
     def _display_entries(self):
-        """显示文件列表"""
+        """显示文件列表和预览"""
+        self._render_left()
+        self._display_preview()  # 更新预览窗口
+        curses.doupdate()
+        
+    def _render_left(self):
+        """绘制文件列表，只移动了光标时只重绘变化的两行"""
+        height, width = self.left_win.getmaxyx()
+        start_index = self._visible_start(height - 4)
+        
+        if (self._dirty_full or self._last_path != self.current_path
+                or self._last_start_index != start_index):
+            self._render_full(start_index)
+        elif self._last_index != self.current_index:
+            self._render_row(self._last_index, start_index, width)
+            self._render_row(self.current_index, start_index, width)
+            
+        self._last_path = self.current_path
+        self._last_start_index = start_index
+        self._last_index = self.current_index
+        self.left_win.noutrefresh()
+        
+    def _render_full(self, start_index: int):
+        """重绘整个文件列表窗口"""
         height, width = self.left_win.getmaxyx()
         self.left_win.erase()
         
         # 显示当前路径
         self.left_win.addstr(0, 0, f"当前路径: {self.current_path}", curses.A_BOLD)
-        self.left_win.addstr(1, 0, "-" * (width - 1))
+        self.left_win.hline(1, 0, "-", width - 1)
         
         # 显示文件列表
-        visible_entries = height - 4
-        start_index = max(0, min(self.current_index - visible_entries // 2,
-                               len(self.entries) - visible_entries))
-        
-        for i in range(visible_entries):
-            idx = start_index + i
-            if idx >= len(self.entries):
-                break
-                
-            entry = self.entries[idx]
-            name = ".." if entry == self.current_path.parent else entry.name
-            
-            attr = curses.A_NORMAL
-            if idx == self.current_index:
-                attr |= curses.A_REVERSE
-            if entry.is_dir():
-                attr |= curses.color_pair(1)
-            else:
-                attr |= curses.color_pair(2)
-                
-            if len(name) > width - 3:
-                name = name[:width-6] + "..."
-                
-            self.left_win.addstr(i + 2, 0, f" {name:<{width-2}}", attr)
+        end_index = min(start_index + height - 4, len(self.entries))
+        for idx in range(start_index, end_index):
+            self._render_row(idx, start_index, width)
             
         # 显示帮助信息
         status_line = "↑↓: 移动  ←→: 导航  Enter: 打开  q: 退出"
         self.left_win.addstr(height-1, 0, status_line[:width-1], curses.A_BOLD)
+        self._dirty_full = False
         
-        self.left_win.noutrefresh()
-        self._display_preview()  # 更新预览窗口
-        curses.doupdate()
+    def _render_row(self, idx: int, start_index: int, width: int):
+        """绘制文件列表中的一行"""
+        name = self.entries[idx]
+        
+        attr = curses.A_NORMAL
+        if idx == self.current_index:
+            attr |= curses.A_REVERSE
+        if self.entries_is_dir[idx]:
+            attr |= self.options.get_color('directory')
+        else:
+            attr |= self.options.get_color('file')
+            
+        if len(name) > width - 3:
+            name = name[:width-6] + "..."
+            
+        self.left_win.addstr(idx - start_index + 2, 0, self._row_fmt(name), attr)
         
     def _load_current_directory(self):
         """加载当前目录内容"""
         try:
-            self.entries = sorted(
-                list(self.current_path.iterdir()),
-                key=lambda x: (not x.is_dir(), x.name.lower())
-            )
+            self.entries, self.entries_is_dir = _scan_directory(self.current_path)
             if self.current_path.parent != self.current_path:  # 不是根目录
-                self.entries.insert(0, self.current_path.parent)  # 添加 ..
+                self.entries.insert(0, PARENT_ENTRY)  # 添加 ..
+                self.entries_is_dir.insert(0, True)
             self.current_index = 0
+            self._dirty_full = True
+            
+            # 后台并行预取前面几个文件的预览
+            files = [self.current_path / name
+                     for name, is_dir in zip(self.entries[:PREFETCH_COUNT], self.entries_is_dir)
+                     if not is_dir]
+            self.preview_handler.prefetch(files)
         except Exception as e:
             raise FileViewerError(f"无法加载目录 {self.current_path}: {str(e)}")
             
-    def _handle_input(self) -> bool:
-        """处理用户输入"""
+    def _handle_input(self) -> Optional[int]:
+        """处理用户输入
+        返回: 需要重绘的区域 (DIRTY_*)，没有状态变化时为 0，退出时为 None
+        """
         key = self.left_win.getch()  # 从左窗口获取输入
         
-        if key in [ord('q'), ord('Q')]:
-            return False
+        if key == -1:
+            # 等待超时说明按键已停止，补上被推迟的预览
+            self.left_win.timeout(-1)
+            self._preview_pending = False
+            return DIRTY_RIGHT
+            
+        elif key in [ord('q'), ord('Q')]:
+            return None
             
         elif key == curses.KEY_UP:
             if self.current_index > 0:
                 self.current_index -= 1
+                self._debounce_preview()
+                return DIRTY_ALL
             
         elif key == curses.KEY_DOWN:
             if self.current_index < len(self.entries) - 1:
                 self.current_index += 1
+                self._debounce_preview()
+                return DIRTY_ALL
             
         elif key in [curses.KEY_RIGHT, ord('\n')]:
-            selected = self.entries[self.current_index]
-            if selected.is_dir():
+            selected = self._entry_path(self.current_index)
+            if self.entries_is_dir[self.current_index]:
                 self.current_path = selected
                 self._load_current_directory()
             else:
                 self._view_file(selected)
+            return DIRTY_ALL
                 
         elif key == curses.KEY_LEFT:
             if self.current_path.parent != self.current_path:
                 self.current_path = self.current_path.parent
                 self._load_current_directory()
+                return DIRTY_ALL
                 
-        return True
+        return 0
+        
+    def _entry_path(self, idx: int) -> Path:
+        """按需构造第 idx 个条目的路径"""
+        name = self.entries[idx]
+        if name == PARENT_ENTRY:
+            return self.current_path.parent
+        return self.current_path / name
+        
+    def _debounce_preview(self):
+        """选择移动后调用，与上一次移动间隔很短时推迟预览，直到按键停止"""
+        now = time.monotonic()
+        if now - self._selection_changed_at < PREVIEW_DEBOUNCE:
+            # getch 在没有按键 PREVIEW_DEBOUNCE 秒后返回 -1
+            self._preview_pending = True
+            self.left_win.timeout(int(PREVIEW_DEBOUNCE * 1000))
+        self._selection_changed_at = now
+        
+    def _scroll_for_key(self, ch: int, visible_lines: int) -> bool:
+        """按阅读模式的导航键更新滚动位置
+        返回: 是否需要重绘内容
+        """
+        # 计算最大滚动位置
+        total_lines = self.viewer.get_line_count()
+        max_scroll = max(0, total_lines - visible_lines)
+        
+        if ch == curses.KEY_UP:
+            if self.scroll_position > 0:
+                self.scroll_position -= 1
+                return True
+        elif ch == curses.KEY_DOWN:
+            if self.scroll_position < max_scroll:
+                self.scroll_position += 1
+                return True
+        elif ch == curses.KEY_PPAGE:  # Page Up
+            self.scroll_position = max(0, self.scroll_position - visible_lines)
+            return True
+        elif ch == curses.KEY_NPAGE:  # Page Down
+            self.scroll_position = min(max_scroll, self.scroll_position + visible_lines)
+            return True
+        elif ch == ord('g'):  # 跳到开头
+            self.scroll_position = 0
+            return True
+        elif ch == ord('G'):  # 跳到结尾
+            self.scroll_position = max_scroll
+            return True
+        return False
         
     def _display_reading_sidebar(self, file_path: Path):
         """显示阅读模式下的左侧边栏"""
@@ -226,7 +450,7 @@ class ViewerUI:
         try:
             # 显示返回提示
             self.left_win.addstr(0, 0, "返回上级:", curses.A_BOLD)
-            self.left_win.addstr(1, 0, "-" * (width - 1))
+            self.left_win.hline(1, 0, "-", width - 1)
             
             # 获取父目录路径
             parent_dir = file_path.parent
@@ -246,17 +470,18 @@ class ViewerUI:
                 display_path = "..." + display_path[-(width-7):]
             
             # 显示路径
-            self.left_win.addstr(2, 1, display_path, curses.color_pair(1))
+            self.left_win.addstr(2, 1, display_path, self.options.get_color('directory'))
             
         except curses.error:
             pass
             
-        self.left_win.refresh()
+        self.left_win.noutrefresh()
 
     def _view_file(self, file_path: Path):
         """查看文件内容"""
         try:
             # 创建新的文件查看器实例
+            self.viewer.close()
             self.viewer = FileViewer(file_path)
             self.viewer.load()
             
@@ -268,6 +493,9 @@ class ViewerUI:
             # 进入阅读模式
             self.reading_mode = True
             self.scroll_position = 0
+            self._hl_cache.clear()
+            self._content_frame_full = False
+            self._content_title = None
             
             # 调整窗口大小
             self._resize_windows(self.reading_left_width)
@@ -276,108 +504,107 @@ class ViewerUI:
             height, _ = self.right_win.getmaxyx()
             visible_lines = height - 4
             
-            # 显示初始内容
+            # 显示初始内容，侧边栏和内容区域暂存后一次性输出
             self._display_reading_sidebar(file_path)
             self._display_file_content(file_path)
+            self._update_frame()
             
             # 主循环
+            last_frame = 0.0
             while True:
-                ch = self.screen.getch()
+                # 从右窗口获取输入，避免 stdscr 的隐式刷新清掉已绘制的内容
+                ch = self.right_win.getch()
                 
-                # 快速退出检查
-                if ch in [27, ord('q')]:  # ESC 或 q
-                    break
-                    
-                # 计算最大滚动位置
-                total_lines = self.viewer.get_line_count()
-                max_scroll = max(0, total_lines - visible_lines)
+                # 按住方向键时按键会连续到达：先处理完已到达的按键，并且
+                # 距上一帧不足 FRAME_INTERVAL 时继续等待，最后只绘制一帧
+                redraw = False
+                leave = False
+                while ch != -1:
+                    # 快速退出检查
+                    if ch in [27, ord('q')]:  # ESC 或 q
+                        leave = True
+                        break
+                    redraw |= self._scroll_for_key(ch, visible_lines)
+                    wait = last_frame + FRAME_INTERVAL - time.monotonic()
+                    self.right_win.timeout(max(0, int(wait * 1000)))
+                    ch = self.right_win.getch()
+                self.right_win.timeout(-1)
                 
-                # 处理导航
-                if ch == curses.KEY_UP:
-                    if self.scroll_position > 0:
-                        self.scroll_position -= 1
-                        self._display_file_content(file_path)
-                elif ch == curses.KEY_DOWN:
-                    if self.scroll_position < max_scroll:
-                        self.scroll_position += 1
-                        self._display_file_content(file_path)
-                elif ch == curses.KEY_PPAGE:  # Page Up
-                    self.scroll_position = max(0, self.scroll_position - visible_lines)
-                    self._display_file_content(file_path)
-                elif ch == curses.KEY_NPAGE:  # Page Down
-                    self.scroll_position = min(max_scroll, self.scroll_position + visible_lines)
-                    self._display_file_content(file_path)
-                elif ch == ord('g'):  # 跳到开头
-                    self.scroll_position = 0
-                    self._display_file_content(file_path)
-                elif ch == ord('G'):  # 跳到结尾
-                    self.scroll_position = max_scroll
+                if leave:
+                    break
+                if redraw:
                     self._display_file_content(file_path)
+                    self._update_frame()
+                    last_frame = time.monotonic()
                     
             # 恢复正常模式
             self.reading_mode = False
             self._resize_windows(self.normal_left_width)
             
-            # 重新加载当前目录
+            # 重新加载当前目录，由主循环负责重绘
+            self.viewer.close()
             self.viewer = FileViewer(self.current_path)
             self._load_current_directory()
-            self._display_entries()
             
         except FileViewerError as e:
             self._show_error(str(e))
             
+    def _update_frame(self):
+        """输出暂存的窗口，并用同步输出序列包住，支持的终端会整帧一次性绘制"""
+        sys.stdout.write(SYNC_UPDATE_BEGIN)
+        sys.stdout.flush()
+        curses.doupdate()
+        sys.stdout.write(SYNC_UPDATE_END)
+        sys.stdout.flush()
+        
     def _display_file_content(self, file_path: Path):
-        """显示文件内容"""
+        """显示文件内容，只滚动一行时利用滚动区域只绘制新露出的一行"""
         height, width = self.right_win.getmaxyx()
-        self.right_win.erase()
+        visible_lines = height - 4
+        total_lines = self.viewer.get_line_count()
+        delta = self.scroll_position - self._last_scroll_position
         
         try:
-            # 显示文件标题
-            title = f"文件: {file_path.name}"
-            if len(title) > width - 2:
-                title = title[:width-5] + "..."
-            self.right_win.addstr(0, 0, title[:width-1], curses.color_pair(3) | curses.A_BOLD)
-            self.right_win.addstr(1, 0, "-" * min(width - 1, 80))
-            
-            # 计算可显示的行范围
-            visible_lines = height - 4
-            total_lines = self.viewer.get_line_count()
-            
-            # 显示内容
-            for i in range(visible_lines):
+            if (self._content_frame_full and abs(delta) == 1
+                    and self.scroll_position + visible_lines <= total_lines):
+                # 内容区域整体滚动一行，再绘制新露出的那一行
+                self.right_win.setscrreg(2, visible_lines + 1)
+                self.right_win.scrollok(True)
+                self.right_win.scroll(delta)
+                self.right_win.scrollok(False)
+                self.right_win.setscrreg(0, height - 1)
+                
+                i = visible_lines - 1 if delta > 0 else 0
                 line_num = self.scroll_position + i
-                if line_num >= total_lines:
-                    break
-                    
-                try:
-                    # 获取当前行内容
-                    line = self.viewer.get_line(line_num)
-                    if line is None:
-                        continue
-                        
-                    # 显示行号
-                    line_num_str = f"{line_num+1:4} "
-                    self.right_win.addstr(i + 2, 0, line_num_str, curses.A_DIM)
-                    
-                    # 获取高亮内容并显示
-                    highlighted = self.highlighter.highlight_line(file_path, line)
-                    current_x = 5
-                    
-                    for text, attr in highlighted:
-                        if current_x >= width:
-                            break
-                        try:
-                            self.right_win.addstr(i + 2, current_x, text, attr)
-                            current_x += len(text)
-                        except curses.error:
-                            break
-                            
-                except curses.error:
-                    continue
+                highlighted = self._get_highlighted(file_path, line_num, line_num + 1, 4 * visible_lines)[0]
+                self._draw_content_line(i, line_num, highlighted, width)
+            else:
+                # 显示文件标题，标题未变化时只清空标题以下的区域
+                title = f"文件: {file_path.name}"
+                if len(title) > width - 2:
+                    title = title[:width-5] + "..."
+                if title != self._content_title:
+                    self.right_win.erase()
+                    self.right_win.addstr(0, 0, title[:width-1], self.options.get_color('selected') | curses.A_BOLD)
+                    self.right_win.hline(1, 0, "-", min(width - 1, 80))
+                    self._content_title = title
+                else:
+                    self.right_win.move(2, 0)
+                    self.right_win.clrtobot()
+                
+                # 获取可见行的高亮结果
+                end = min(self.scroll_position + visible_lines, total_lines)
+                highlighted_lines = self._get_highlighted(file_path, self.scroll_position, end, 4 * visible_lines)
+                
+                # 显示内容
+                for i, highlighted in enumerate(highlighted_lines):
+                    self._draw_content_line(i, self.scroll_position + i, highlighted, width)
                     
             # 显示加载状态
-            if self.viewer.loading_thread and self.viewer.loading_thread.is_alive():
+            if self.viewer.is_loading:
                 status = "正在加载..."
+            elif self.viewer.load_error:
+                status = f"加载失败: {self.viewer.load_error}"
             else:
                 status = f"第 {self.scroll_position + 1}-{min(self.scroll_position + visible_lines, total_lines)} 行，共 {total_lines} 行"
                 
@@ -391,7 +618,53 @@ class ViewerUI:
         except curses.error:
             pass
             
-        self.right_win.refresh()
+        # 内容区域填满时，下一次滚动一行才可以复用已绘制的内容
+        self._last_scroll_position = self.scroll_position
+        self._content_frame_full = self.scroll_position + visible_lines <= total_lines
+        self.right_win.noutrefresh()
+        
+    def _draw_content_line(self, i: int, line_num: int, highlighted: List[Tuple[str, int]], width: int):
+        """在内容区域第 i 行绘制行号和高亮后的文本"""
+        # 每帧对每个可见行都会调用，循环内使用局部变量，避免重复的属性查找
+        addstr = self.right_win.addstr
+        row = i + 2
+        try:
+            # 显示行号
+            addstr(row, 0, _LINENO_FMT(line_num + 1), curses.A_DIM)
+            
+            # 显示高亮内容，按显示宽度截断到窗口宽度，避免宽字符或制表符折行到下一行
+            current_x = 5
+            for text, attr in highlighted:
+                if current_x >= width:
+                    break
+                text, next_x = _clip_cells(text, current_x, width)
+                if text:
+                    addstr(row, current_x, text, attr)
+                current_x = next_x
+                
+        except curses.error:
+            pass
+            
+    def _get_highlighted(self, file_path: Path, start: int, end: int,
+                         cache_size: int) -> List[List[Tuple[str, int]]]:
+        """获取 [start, end) 行的高亮结果，未缓存的行一次性批量高亮"""
+        cache = self._hl_cache
+        missing = [n for n in range(start, end) if (file_path, n) not in cache]
+        if missing:
+            # 滚动时缺失的行是连续的，合并为一批高亮
+            first, last = missing[0], missing[-1] + 1
+            lines = [self.viewer.get_line(n) or '' for n in range(first, last)]
+            for n, highlighted in enumerate(self.highlighter.highlight_lines(file_path, lines), start=first):
+                cache[(file_path, n)] = highlighted
+                
+        result = []
+        for n in range(start, end):
+            cache.move_to_end((file_path, n))
+            result.append(cache[(file_path, n)])
+            
+        while len(cache) > cache_size:
+            cache.popitem(last=False)
+        return result
         
     def _show_error(self, message: str):
         """显示错误信息"""
@@ -405,15 +678,27 @@ class ViewerUI:
             self._init_curses()
             self._load_current_directory()
             
+            self._display_entries()
             while True:
-                self._display_entries()
-                if not self._handle_input():
+                mask = self._handle_input()
+                if mask is None:
                     break
                     
+                # 只重绘状态发生变化的区域，没有变化的按键不刷新屏幕
+                if mask & DIRTY_LEFT:
+                    self._render_left()
+                if mask & DIRTY_RIGHT:
+                    self._display_preview()
+                if mask:
+                    curses.doupdate()
+                    
         except Exception as e:
             if hasattr(self, '_cleanup_curses'):
                 self._cleanup_curses()
             print(f"发生错误: {str(e)}")
         finally:
             if hasattr(self, '_cleanup_curses'):
-                self._cleanup_curses() 
\ No newline at end of file
+                self._cleanup_curses()
+            # 释放文件映射，仍在后台加载的任务随之结束，不会拖住解释器退出
+            self.viewer.close()
+            self.preview_handler.close() 
\ No newline at end of file